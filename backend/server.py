@@ -1,36 +1,93 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Request, status
+from fastapi.responses import ORJSONResponse
+from fastapi.security import HTTPBearer
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, BeforeValidator, WithJsonSchema
+from typing import Annotated, Dict, List, Optional
+import asyncio
+import concurrent.futures
+import hashlib
+import hmac
+import multiprocessing
+import time
 import uuid
 from datetime import datetime, timezone, timedelta
 import bcrypt
 import jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from cachetools import TTLCache
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', '200'))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', '20'))
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=MONGO_MAX_POOL_SIZE,
+    minPoolSize=MONGO_MIN_POOL_SIZE,
+    compressors="zstd,zlib",
+    serverSelectionTimeoutMS=3000,
+    uuidRepresentation="standard"
+)
 db = client[os.environ['DB_NAME']]
 
 # JWT Settings
 SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'your-secret-key-change-in-production')
+SECRET_KEY_BYTES = SECRET_KEY.encode('utf-8')
 ALGORITHM = "HS256"
+ALGORITHMS = [ALGORITHM]
+# Reused for every token; only the checks our tokens need are enabled
+jwt_codec = jwt.PyJWT(options={
+    "verify_signature": True,
+    "verify_exp": True,
+    "verify_nbf": False,
+    "verify_iat": False,
+    "verify_aud": False,
+    "verify_iss": False,
+})
 ACCESS_TOKEN_EXPIRE_DAYS = 30
 INSPECTOR_CREATION_PASSWORD = "Chiru_041217_"
 
 # Security
-security = HTTPBearer()
-
-app = FastAPI()
+class BearerToken(HTTPBearer):
+    # Same scheme and 403 responses as HTTPBearer, but yields the raw token
+    # instead of building a credentials model per request
+    async def __call__(self, request: Request) -> str:
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        if not (scheme and token):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authenticated")
+        if scheme.lower() != "bearer":
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid authentication credentials")
+        return token
+
+security = BearerToken(scheme_name="HTTPBearer")
+password_hasher = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=1)
+# Password hashing is CPU-bound; it runs in a process pool started with the app
+password_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+# Verified token cache: raw token -> (exp timestamp, user dict)
+TOKEN_CACHE_TTL_SECONDS = 300
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=TOKEN_CACHE_TTL_SECONDS)
+_token_locks: Dict[str, asyncio.Lock] = {}
+
+# GET /inspections results per user id; cleared on car and inspection writes
+_inspections_cache: TTLCache = TTLCache(maxsize=4096, ttl=15)
+
+# Recently verified logins: keyed digest of (email, password) -> stored hash it matched
+_login_cache: TTLCache = TTLCache(maxsize=1024, ttl=60)
+
+app = FastAPI(default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 
 # Models
@@ -54,7 +111,7 @@ class UserLogin(BaseModel):
     password: str
 
 class UserResponse(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", frozen=True)
     id: str
     name: str
     phone: str
@@ -71,11 +128,29 @@ class TokenResponse(BaseModel):
 class AddCarRequest(BaseModel):
     license_plate: str
 
+DATE_FORMAT = "%d-%m-%Y"
+
+def parse_date(value):
+    # Dates arrive as DD-MM-YYYY and are stored as BSON datetimes
+    if not isinstance(value, str):
+        raise ValueError("Data trebuie să fie în formatul DD-MM-YYYY")
+    try:
+        return datetime.strptime(value, DATE_FORMAT)
+    except ValueError:
+        raise ValueError("Data trebuie să fie în formatul DD-MM-YYYY")
+
+# Stored as a datetime, but documented as the DD-MM-YYYY string clients send
+InspectionDate = Annotated[
+    datetime,
+    BeforeValidator(parse_date),
+    WithJsonSchema({"type": "string", "pattern": r"^\d{2}-\d{2}-\d{4}$", "example": "31-12-2025"})
+]
+
 class InspectionCreate(BaseModel):
     car_license_plate: str
     owner_phone: str
-    inspection_date: str  # DD-MM-YYYY
-    expiry_date: str  # DD-MM-YYYY
+    inspection_date: InspectionDate
+    expiry_date: InspectionDate
     inspector_name: str
     inspector_phone: str
     car_kilometers: int
@@ -83,14 +158,15 @@ class InspectionCreate(BaseModel):
 class InspectionUpdate(BaseModel):
     car_license_plate: Optional[str] = None
     owner_phone: Optional[str] = None
-    inspection_date: Optional[str] = None
-    expiry_date: Optional[str] = None
+    # Omitting a date leaves it unchanged; an explicit null is rejected like any other bad date
+    inspection_date: InspectionDate = None
+    expiry_date: InspectionDate = None
     inspector_name: Optional[str] = None
     inspector_phone: Optional[str] = None
     car_kilometers: Optional[int] = None
 
 class InspectionResponse(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", frozen=True)
     id: str
     car_license_plate: str
     owner_phone: str
@@ -101,45 +177,163 @@ class InspectionResponse(BaseModel):
     car_kilometers: int
     created_at: str
 
+# Only the fields InspectionResponse exposes
+INSPECTION_PROJECTION = {"_id": 0, **{field: 1 for field in InspectionResponse.model_fields}}
+MAX_INSPECTION_RESULTS = 1000
+# List endpoints return our own documents as-is; the schema is documented, not enforced
+INSPECTION_LIST_RESPONSES = {200: {"model": List[InspectionResponse]}}
+
 # Helper functions
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+async def run_in_password_pool(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(password_pool, func, *args)
+
+async def hash_password(password: str) -> str:
+    return await run_in_password_pool(password_hasher.hash, password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    # Legacy bcrypt hashes are still accepted until the user logs in again
+    if hashed_password.startswith("$2"):
+        return await run_in_password_pool(
+            bcrypt.checkpw, plain_password.encode('utf-8'), hashed_password.encode('utf-8')
+        )
+    try:
+        return await run_in_password_pool(password_hasher.verify, hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+def login_cache_key(email: str, password: str) -> bytes:
+    # Never keep the raw password; the key is an HMAC over its digest
+    password_digest = hashlib.sha256(password.encode('utf-8')).hexdigest()
+    return hmac.new(SECRET_KEY_BYTES, f"{email}:{password_digest}".encode('utf-8'), hashlib.sha256).digest()
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    if hashed_password.startswith("$2"):
+        return True
+    return password_hasher.check_needs_rehash(hashed_password)
+
+def serialize_inspection(insp: dict) -> dict:
+    # Format stored datetimes back into the strings the API exposes
+    for field in ("inspection_date", "expiry_date"):
+        value = insp.get(field)
+        if isinstance(value, datetime):
+            insp[field] = value.strftime(DATE_FORMAT)
+    created_at = insp.get("created_at")
+    if isinstance(created_at, datetime):
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        insp["created_at"] = created_at.isoformat()
+    return insp
+
+async def find_inspections(query: dict) -> List[dict]:
+    cursor = db.inspections.find(query, INSPECTION_PROJECTION).limit(MAX_INSPECTION_RESULTS)
+    return [serialize_inspection(insp) async for insp in cursor]
+
+def user_claims(user: dict) -> dict:
+    # Identity fields signed into the token so requests need no user lookup
+    return {
+        "sub": user["id"],
+        "name": user["name"],
+        "phone": user["phone"],
+        "email": user["email"],
+        "role": user["role"],
+        "inspector_id": user.get("inspector_id")
+    }
+
+def user_from_claims(payload: dict) -> dict:
+    return {
+        "id": payload["sub"],
+        "name": payload["name"],
+        "phone": payload["phone"],
+        "email": payload["email"],
+        "role": payload["role"],
+        "inspector_id": payload.get("inspector_id")
+    }
+
+def user_payload(user: dict) -> dict:
+    # The UserResponse fields as a plain dict, ready for ORJSONResponse
+    return {
+        "id": user["id"],
+        "name": user["name"],
+        "phone": user["phone"],
+        "email": user["email"],
+        "role": user["role"],
+        "inspector_id": user.get("inspector_id"),
+        "cars": user.get("cars", [])
+    }
+
+def token_response(user: dict) -> ORJSONResponse:
+    return ORJSONResponse({
+        "access_token": create_access_token(user_claims(user)),
+        "token_type": "bearer",
+        "user": user_payload(user)
+    })
+
+async def get_user_cars(user_id: str) -> List[str]:
+    # Cars change independently of the token, so they are always read fresh
+    user = await db.users.find_one({"id": user_id}, {"_id": 0, "cars": 1})
+    return user.get("cars", []) if user else []
 
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(days=ACCESS_TOKEN_EXPIRE_DAYS)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt_codec.encode(to_encode, SECRET_KEY_BYTES, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    try:
-        token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Token invalid")
-        
-        user = await db.users.find_one({"id": user_id}, {"_id": 0})
-        if user is None:
-            raise HTTPException(status_code=401, detail="Utilizator negăsit")
+def _get_cached_user(token: str) -> Optional[dict]:
+    cached = _token_cache.get(token)
+    if cached is None:
+        return None
+    expires_at, user = cached
+    if expires_at <= time.time():
+        _token_cache.pop(token, None)
+        return None
+    return user
+
+async def get_current_user(token: str = Depends(security)):
+    user = _get_cached_user(token)
+    if user is not None:
         return user
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Token expirat")
-    except jwt.InvalidTokenError:
-        raise HTTPException(status_code=401, detail="Token invalid")
+
+    lock = _token_locks.setdefault(token, asyncio.Lock())
+    try:
+        async with lock:
+            # Another request may have filled the cache while we waited
+            user = _get_cached_user(token)
+            if user is not None:
+                return user
+
+            try:
+                payload = jwt_codec.decode(token, SECRET_KEY_BYTES, algorithms=ALGORITHMS)
+            except jwt.ExpiredSignatureError:
+                raise HTTPException(status_code=401, detail="Token expirat")
+            except jwt.InvalidTokenError:
+                raise HTTPException(status_code=401, detail="Token invalid")
+
+            user_id: str = payload.get("sub")
+            if user_id is None:
+                raise HTTPException(status_code=401, detail="Token invalid")
+
+            if "role" in payload:
+                user = user_from_claims(payload)
+            else:
+                # Tokens issued before identity claims were added
+                user = await db.users.find_one({"id": user_id}, {"_id": 0, "password": 0, "cars": 0})
+                if user is None:
+                    raise HTTPException(status_code=401, detail="Utilizator negăsit")
+
+            # Failed validations above are never cached
+            now = time.time()
+            expires_at = min(payload.get("exp", now + TOKEN_CACHE_TTL_SECONDS), now + TOKEN_CACHE_TTL_SECONDS)
+            _token_cache[token] = (expires_at, user)
+            return user
+    finally:
+        if not lock.locked():
+            _token_locks.pop(token, None)
 
 # Auth Routes
 @api_router.post("/auth/register", response_model=TokenResponse)
 async def register(user_data: UserCreate):
-    # Check if user exists
-    existing_user = await db.users.find_one({"email": user_data.email})
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Email-ul este deja înregistrat")
-    
     # Validate role
     if user_data.role not in ["client", "inspector"]:
         raise HTTPException(status_code=400, detail="Rol invalid")
@@ -152,8 +346,8 @@ async def register(user_data: UserCreate):
             raise HTTPException(status_code=403, detail="Parolă de creare inspector incorectă")
     
     # Create user
-    user_id = str(uuid.uuid4())
-    hashed_pw = hash_password(user_data.password)
+    user_id = uuid.uuid4().hex
+    hashed_pw = await hash_password(user_data.password)
     
     user_dict = {
         "id": user_id,
@@ -163,33 +357,19 @@ async def register(user_data: UserCreate):
         "role": user_data.role,
         "password": hashed_pw,
         "cars": [],
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "created_at": datetime.now(timezone.utc)
     }
     
     if user_data.role == "inspector":
         user_dict["inspector_id"] = user_data.inspector_id
     
-    await db.users.insert_one(user_dict)
-    
-    # Create token
-    access_token = create_access_token({"sub": user_id})
-    
-    # Prepare response
-    user_response = UserResponse(
-        id=user_id,
-        name=user_data.name,
-        phone=user_data.phone,
-        email=user_data.email,
-        role=user_data.role,
-        inspector_id=user_data.inspector_id if user_data.role == "inspector" else None,
-        cars=[]
-    )
+    # The unique index on email rejects duplicates atomically
+    try:
+        await db.users.insert_one(user_dict)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email-ul este deja înregistrat")
     
-    return TokenResponse(
-        access_token=access_token,
-        token_type="bearer",
-        user=user_response
-    )
+    return token_response(user_dict)
 
 @api_router.post("/auth/login", response_model=TokenResponse)
 async def login(login_data: UserLogin):
@@ -197,38 +377,29 @@ async def login(login_data: UserLogin):
     if not user:
         raise HTTPException(status_code=401, detail="Email sau parolă incorectă")
     
-    if not verify_password(login_data.password, user["password"]):
-        raise HTTPException(status_code=401, detail="Email sau parolă incorectă")
-    
-    access_token = create_access_token({"sub": user["id"]})
-    
-    user_response = UserResponse(
-        id=user["id"],
-        name=user["name"],
-        phone=user["phone"],
-        email=user["email"],
-        role=user["role"],
-        inspector_id=user.get("inspector_id"),
-        cars=user.get("cars", [])
-    )
+    # A cached entry only counts while the stored hash is unchanged
+    cache_key = login_cache_key(login_data.email, login_data.password)
+    verified_hash = _login_cache.get(cache_key)
+    if verified_hash is None or not hmac.compare_digest(verified_hash, user["password"].encode('utf-8')):
+        if not await verify_password(login_data.password, user["password"]):
+            raise HTTPException(status_code=401, detail="Email sau parolă incorectă")
+        
+        # Upgrade legacy bcrypt hashes to argon2id
+        if password_needs_rehash(user["password"]):
+            user["password"] = await hash_password(login_data.password)
+            await db.users.update_one(
+                {"id": user["id"]},
+                {"$set": {"password": user["password"]}}
+            )
+        
+        _login_cache[cache_key] = user["password"].encode('utf-8')
     
-    return TokenResponse(
-        access_token=access_token,
-        token_type="bearer",
-        user=user_response
-    )
+    return token_response(user)
 
 @api_router.get("/auth/me", response_model=UserResponse)
 async def get_me(current_user: dict = Depends(get_current_user)):
-    return UserResponse(
-        id=current_user["id"],
-        name=current_user["name"],
-        phone=current_user["phone"],
-        email=current_user["email"],
-        role=current_user["role"],
-        inspector_id=current_user.get("inspector_id"),
-        cars=current_user.get("cars", [])
-    )
+    cars = await get_user_cars(current_user["id"])
+    return ORJSONResponse(user_payload({**current_user, "cars": cars}))
 
 # User Routes
 @api_router.post("/users/add-car")
@@ -236,34 +407,34 @@ async def add_car(car_data: AddCarRequest, current_user: dict = Depends(get_curr
     if current_user["role"] != "client":
         raise HTTPException(status_code=403, detail="Doar clienții pot adăuga mașini")
     
-    cars = current_user.get("cars", [])
-    if car_data.license_plate in cars:
-        raise HTTPException(status_code=400, detail="Mașina este deja adăugată")
-    
-    cars.append(car_data.license_plate)
-    await db.users.update_one(
-        {"id": current_user["id"]},
-        {"$set": {"cars": cars}}
+    updated = await db.users.find_one_and_update(
+        {"id": current_user["id"], "cars": {"$ne": car_data.license_plate}},
+        {"$addToSet": {"cars": car_data.license_plate}},
+        projection={"_id": 0, "cars": 1},
+        return_document=ReturnDocument.AFTER
     )
+    if updated is None:
+        raise HTTPException(status_code=400, detail="Mașina este deja adăugată")
+    _inspections_cache.pop(current_user["id"], None)
     
-    return {"message": "Mașină adăugată cu succes", "cars": cars}
+    return {"message": "Mașină adăugată cu succes", "cars": updated["cars"]}
 
 @api_router.delete("/users/remove-car/{license_plate}")
 async def remove_car(license_plate: str, current_user: dict = Depends(get_current_user)):
     if current_user["role"] != "client":
         raise HTTPException(status_code=403, detail="Doar clienții pot șterge mașini")
     
-    cars = current_user.get("cars", [])
-    if license_plate not in cars:
-        raise HTTPException(status_code=404, detail="Mașină negăsită")
-    
-    cars.remove(license_plate)
-    await db.users.update_one(
-        {"id": current_user["id"]},
-        {"$set": {"cars": cars}}
+    updated = await db.users.find_one_and_update(
+        {"id": current_user["id"], "cars": license_plate},
+        {"$pull": {"cars": license_plate}},
+        projection={"_id": 0, "cars": 1},
+        return_document=ReturnDocument.AFTER
     )
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Mașină negăsită")
+    _inspections_cache.pop(current_user["id"], None)
     
-    return {"message": "Mașină ștearsă cu succes", "cars": cars}
+    return {"message": "Mașină ștearsă cu succes", "cars": updated["cars"]}
 
 # Inspection Routes
 @api_router.post("/inspections", response_model=InspectionResponse)
@@ -271,7 +442,10 @@ async def create_inspection(inspection_data: InspectionCreate, current_user: dic
     if current_user["role"] != "inspector":
         raise HTTPException(status_code=403, detail="Doar inspectorii pot crea inspecții")
     
-    inspection_id = str(uuid.uuid4())
+    inspection_id = uuid.uuid4().hex
+    # BSON keeps milliseconds; truncate now so this response matches later reads
+    now = datetime.now(timezone.utc)
+    created_at = now.replace(microsecond=now.microsecond // 1000 * 1000)
     inspection_dict = {
         "id": inspection_id,
         "car_license_plate": inspection_data.car_license_plate,
@@ -281,63 +455,64 @@ async def create_inspection(inspection_data: InspectionCreate, current_user: dic
         "inspector_name": inspection_data.inspector_name,
         "inspector_phone": inspection_data.inspector_phone,
         "car_kilometers": inspection_data.car_kilometers,
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "created_at": created_at
     }
     
     await db.inspections.insert_one(inspection_dict)
+    _inspections_cache.clear()
     
-    return InspectionResponse(**inspection_dict)
+    return InspectionResponse.model_construct(**serialize_inspection(inspection_dict))
 
-@api_router.get("/inspections", response_model=List[InspectionResponse])
+@api_router.get("/inspections", responses=INSPECTION_LIST_RESPONSES)
 async def get_inspections(current_user: dict = Depends(get_current_user)):
+    inspections = _inspections_cache.get(current_user["id"])
+    if inspections is not None:
+        return ORJSONResponse(inspections)
+    
     if current_user["role"] == "client":
         # Client can only see their own cars' inspections
-        cars = current_user.get("cars", [])
-        if not cars:
-            return []
-        inspections = await db.inspections.find(
-            {"car_license_plate": {"$in": cars}},
-            {"_id": 0}
-        ).to_list(1000)
+        cars = await get_user_cars(current_user["id"])
+        inspections = await find_inspections({"car_license_plate": {"$in": cars}}) if cars else []
     else:
         # Inspector can see all inspections
-        inspections = await db.inspections.find({}, {"_id": 0}).to_list(1000)
+        inspections = await find_inspections({})
     
-    return [InspectionResponse(**insp) for insp in inspections]
+    _inspections_cache[current_user["id"]] = inspections
+    return ORJSONResponse(inspections)
 
-@api_router.get("/inspections/search/{license_plate}", response_model=List[InspectionResponse])
+@api_router.get("/inspections/search/{license_plate}", responses=INSPECTION_LIST_RESPONSES)
 async def search_inspections(license_plate: str, current_user: dict = Depends(get_current_user)):
     if current_user["role"] == "client":
         # Client can only search their own cars
-        cars = current_user.get("cars", [])
+        cars = await get_user_cars(current_user["id"])
         if license_plate not in cars:
             raise HTTPException(status_code=403, detail="Nu aveți permisiunea de a vedea această mașină")
     
-    inspections = await db.inspections.find(
-        {"car_license_plate": license_plate},
-        {"_id": 0}
-    ).to_list(1000)
+    inspections = await find_inspections({"car_license_plate": license_plate})
     
-    return [InspectionResponse(**insp) for insp in inspections]
+    return ORJSONResponse(inspections)
 
 @api_router.put("/inspections/{inspection_id}", response_model=InspectionResponse)
 async def update_inspection(inspection_id: str, inspection_data: InspectionUpdate, current_user: dict = Depends(get_current_user)):
     if current_user["role"] != "inspector":
         raise HTTPException(status_code=403, detail="Doar inspectorii pot actualiza inspecțiile")
     
-    inspection = await db.inspections.find_one({"id": inspection_id}, {"_id": 0})
-    if not inspection:
-        raise HTTPException(status_code=404, detail="Inspecție negăsită")
-    
     update_data = inspection_data.model_dump(exclude_unset=True)
     if update_data:
-        await db.inspections.update_one(
+        inspection = await db.inspections.find_one_and_update(
             {"id": inspection_id},
-            {"$set": update_data}
+            {"$set": update_data},
+            projection=INSPECTION_PROJECTION,
+            return_document=ReturnDocument.AFTER
         )
-        inspection.update(update_data)
+    else:
+        inspection = await db.inspections.find_one({"id": inspection_id}, INSPECTION_PROJECTION)
+    if inspection is None:
+        raise HTTPException(status_code=404, detail="Inspecție negăsită")
+    if update_data:
+        _inspections_cache.clear()
     
-    return InspectionResponse(**inspection)
+    return InspectionResponse.model_construct(**serialize_inspection(inspection))
 
 @api_router.delete("/inspections/{inspection_id}")
 async def delete_inspection(inspection_id: str, current_user: dict = Depends(get_current_user)):
@@ -347,40 +522,30 @@ async def delete_inspection(inspection_id: str, current_user: dict = Depends(get
     result = await db.inspections.delete_one({"id": inspection_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Inspecție negăsită")
+    _inspections_cache.clear()
     
     return {"message": "Inspecție ștearsă cu succes"}
 
-@api_router.get("/inspections/expiring/soon", response_model=List[InspectionResponse])
+@api_router.get("/inspections/expiring/soon", responses=INSPECTION_LIST_RESPONSES)
 async def get_expiring_inspections(current_user: dict = Depends(get_current_user)):
     # Get inspections expiring in next 30 days
-    today = datetime.now(timezone.utc)
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+    query = {
+        "expiry_date": {
+            "$gte": today,
+            "$lte": today + timedelta(days=30)
+        }
+    }
     
     if current_user["role"] == "client":
-        cars = current_user.get("cars", [])
+        cars = await get_user_cars(current_user["id"])
         if not cars:
             return []
-        inspections = await db.inspections.find(
-            {"car_license_plate": {"$in": cars}},
-            {"_id": 0}
-        ).to_list(1000)
-    else:
-        inspections = await db.inspections.find({}, {"_id": 0}).to_list(1000)
+        query["car_license_plate"] = {"$in": cars}
     
-    # Filter expiring inspections
-    expiring = []
-    for insp in inspections:
-        try:
-            # Parse DD-MM-YYYY format
-            expiry_parts = insp["expiry_date"].split("-")
-            expiry_date = datetime(int(expiry_parts[2]), int(expiry_parts[1]), int(expiry_parts[0]))
-            days_until_expiry = (expiry_date - today).days
-            
-            if 0 <= days_until_expiry <= 30:
-                expiring.append(InspectionResponse(**insp))
-        except:
-            continue
+    inspections = await find_inspections(query)
     
-    return expiring
+    return ORJSONResponse(inspections)
 
 # Include router
 app.include_router(api_router)
@@ -399,6 +564,60 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _string_to_date(field: str, date_format: Optional[str] = None) -> dict:
+    # Aggregation expression parsing a string field into a date, keeping other values
+    date_from_string = {"dateString": f"${field}", "onError": f"${field}"}
+    if date_format:
+        date_from_string["format"] = date_format
+    return {"$cond": [
+        {"$eq": [{"$type": f"${field}"}, "string"]},
+        {"$dateFromString": date_from_string},
+        f"${field}"
+    ]}
+
+@app.on_event("startup")
+async def start_password_pool():
+    global password_pool
+    # Spawned workers never inherit the Motor client or its sockets
+    password_pool = concurrent.futures.ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn")
+    )
+
+@app.on_event("startup")
+async def warm_db_pool():
+    # Open the minimum pool up front instead of on the first requests
+    await asyncio.gather(*(db.command("ping") for _ in range(MONGO_MIN_POOL_SIZE)))
+
+@app.on_event("startup")
+async def create_indexes():
+    await db.users.create_index("email", unique=True)
+    await db.users.create_index("id", unique=True)
+    await db.inspections.create_index("id", unique=True)
+    await db.inspections.create_index([("car_license_plate", 1), ("expiry_date", 1)])
+    await db.inspections.create_index("expiry_date")
+    
+    # Convert inspections stored with string dates; unparseable values are left as-is
+    await db.inspections.update_many(
+        {"$or": [
+            {"inspection_date": {"$type": "string"}},
+            {"expiry_date": {"$type": "string"}},
+            {"created_at": {"$type": "string"}}
+        ]},
+        [{"$set": {
+            "inspection_date": _string_to_date("inspection_date", DATE_FORMAT),
+            "expiry_date": _string_to_date("expiry_date", DATE_FORMAT),
+            "created_at": _string_to_date("created_at")
+        }}]
+    )
+    await db.users.update_many(
+        {"created_at": {"$type": "string"}},
+        [{"$set": {"created_at": _string_to_date("created_at")}}]
+    )
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    client.close()
+    # The pool is missing if start_password_pool never ran or failed
+    if password_pool is not None:
+        password_pool.shutdown(wait=False, cancel_futures=True)
\ No newline at end of file